@@ -9,17 +9,123 @@
 4. 错误处理演示
 """
 
-import requests
+import asyncio
+from collections import defaultdict
+import contextvars
+import inspect
+import io
+import os
+import queue
+import signal
+import sys
+import threading
 import time
-import json
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, NamedTuple, Optional
+
+from demo_common import JSON_HEADERS, check_server, json_dumps, json_loads
+
+# requests / aiohttp / json / datetime 在实际使用处按需导入，菜单启动时不承担其导入开销
+
+
+class Reading(NamedTuple):
+    """单个读取结果（属性访问，替代逐项的 dict 查找）"""
+    name: str
+    success: bool
+    value: Any = None
+    error: Optional[str] = None
+
+
+def _to_readings(result: Dict[str, Any]) -> Dict[str, Any]:
+    """把响应 data 中的结果项一次性转换为 Reading"""
+    result["data"] = [
+        Reading(item["name"], item.get("success", False), item.get("value"), item.get("error"))
+        for item in result.get("data") or []
+    ]
+    return result
+
+
+def _error_result(message: str) -> Dict[str, Any]:
+    """构造与接口响应格式一致的失败结果"""
+    return {
+        "state": -1,
+        "message": message,
+        "data": []
+    }
+
+
+def _channel_order(items: List[Dict[str, Any]]) -> Optional[List[int]]:
+    """
+    跨通道读取时，返回按 (channel_id, addr) 排序后的下标顺序
+    
+    同一通道的读取项在请求中相邻，服务端逐项处理时可以连续复用该通道的连接。
+    只有一个通道时返回 None（无需排序）
+    """
+    if len({item["channel_id"] for item in items}) <= 1:
+        return None
+    return sorted(
+        range(len(items)),
+        key=lambda i: (items[i]["channel_id"], items[i].get("addr", 0))
+    )
+
+
+def _restore_order(
+    result: Dict[str, Any],
+    items: List[Dict[str, Any]],
+    order: Optional[List[int]]
+) -> Dict[str, Any]:
+    """
+    把按 order 发送的请求结果还原为 items 的顺序
+    
+    结果数量与 items 不一致时改为按 name 对齐，缺失的项标记为失败，
+    保证按位置读取结果的调用方不会把数值对应到错误的名称上
+    """
+    data = result.get("data")
+    if not data:
+        return result
+    
+    if len(data) != len(items):
+        by_name = {item.name: item for item in data}
+        result["data"] = [
+            by_name.get(item["name"]) or Reading(item["name"], False, error="响应中缺少该项")
+            for item in items
+        ]
+    elif order is not None:
+        restored = [None] * len(order)
+        for pos, index in enumerate(order):
+            restored[index] = data[pos]
+        result["data"] = restored
+    return result
 
 class DeviceClient:
     """设备控制客户端"""
     
     def __init__(self, base_url: str = "http://localhost:8080"):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
         self.base_url = base_url
+        # 复用连接池，避免每次请求都重新建立 TCP 连接
+        self.session = requests.Session()
+        self.session.headers.update({"Connection": "keep-alive"})
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        )
+        self.session.mount("http://", adapter)
+        # 在此绑定，避免每次请求重复导入 requests
+        self._errors = requests.exceptions.RequestException
+    
+    def close(self):
+        """关闭连接池"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
     
     def batch_read(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -29,19 +135,29 @@ class DeviceClient:
             items: 读取项列表，每项包含 name, channel_id 和协议相关参数
         
         Returns:
-            API 响应结果
+            API 响应结果，data 中的结果项为 Reading
         """
+        order = _channel_order(items)
+        sent = items if order is None else [items[i] for i in order]
+        
         url = f"{self.base_url}/device/batchRead"
         try:
-            response = requests.post(url, json={"items": items}, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            return {
-                "state": -1,
-                "message": f"请求失败: {e}",
-                "data": []
-            }
+            response = self.session.post(
+                url,
+                data=json_dumps({"items": sent}),
+                headers=JSON_HEADERS,
+                timeout=10
+            )
+        except self._errors as e:
+            return _error_result(f"请求失败: {e}")
+        
+        if response.status_code >= 400:
+            return _error_result(f"请求失败: HTTP {response.status_code}")
+        try:
+            result = _to_readings(json_loads(response.content))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            return _error_result(f"响应解析失败: {e!r}")
+        return _restore_order(result, items, order)
     
     def batch_read_dict(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -55,12 +171,12 @@ class DeviceClient:
         """
         result = self.batch_read(items)
         return {
-            item["name"]: item.get("value") 
+            item.name: item.value
             for item in result.get("data", [])
-            if item.get("success", False)
+            if item.success
         }
     
-    def batch_read_with_metadata(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def batch_read_with_metadata(self, items: List[Dict[str, Any]]) -> List[Reading]:
         """
         批量读取并保留完整元数据
         
@@ -71,56 +187,277 @@ class DeviceClient:
         return result.get("data", [])
 
 
+class AsyncDeviceClient:
+    """异步设备控制客户端（基于 aiohttp）"""
+    
+    def __init__(self, base_url: str = "http://localhost:8080"):
+        self.base_url = base_url
+        self.session = None
+        # 在 __aenter__ 中绑定，避免每次请求重复导入 aiohttp
+        self._timeout = None
+        self._errors = ()
+    
+    async def __aenter__(self):
+        try:
+            import aiohttp
+        except ImportError:
+            raise RuntimeError("异步客户端需要 aiohttp: pip install aiohttp") from None
+        
+        self._timeout = aiohttp.ClientTimeout(total=10)
+        self._errors = (aiohttp.ClientError, asyncio.TimeoutError)
+        connector = aiohttp.TCPConnector(limit_per_host=8, keepalive_timeout=30)
+        self.session = aiohttp.ClientSession(connector=connector)
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.session.close()
+    
+    async def batch_read(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        异步批量读取数据
+        
+        Args:
+            items: 读取项列表，每项包含 name, channel_id 和协议相关参数
+        
+        Returns:
+            API 响应结果，data 中的结果项为 Reading
+        """
+        order = _channel_order(items)
+        sent = items if order is None else [items[i] for i in order]
+        result = await self.batch_read_encoded(json_dumps({"items": sent}))
+        return _restore_order(result, items, order)
+    
+    async def batch_read_dict(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        异步批量读取并返回字典格式 {name: value}
+        
+        Args:
+            items: 读取项列表
+        
+        Returns:
+            {name: value} 字典，只包含成功读取的项
+        """
+        result = await self.batch_read(items)
+        return {
+            item.name: item.value
+            for item in result.get("data", [])
+            if item.success
+        }
+    
+    async def batch_read_encoded(self, body: bytes) -> Dict[str, Any]:
+        """
+        使用预先编码好的请求体批量读取，适合读取项固定的周期采集
+        
+        Args:
+            body: 已编码的 {"items": [...]} JSON 请求体
+        
+        Returns:
+            API 响应结果，data 中的结果项为 Reading
+        """
+        url = f"{self.base_url}/device/batchRead"
+        try:
+            async with self.session.post(
+                url,
+                data=body,
+                headers=JSON_HEADERS,
+                timeout=self._timeout
+            ) as response:
+                if response.status >= 400:
+                    return _error_result(f"请求失败: HTTP {response.status}")
+                body = await response.read()
+        except self._errors as e:
+            return _error_result(f"请求失败: {e}")
+        
+        try:
+            return _to_readings(json_loads(body))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            return _error_result(f"响应解析失败: {e!r}")
+
+
+class PeriodicTimer:
+    """
+    固定周期定时器
+    
+    Linux (Python 3.13+) 上使用 timerfd，其余平台按单调时钟截止时间休眠，
+    采样周期不受单次读取耗时和 sleep 抖动的影响
+    """
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._deadline = time.monotonic() + interval
+        self._fd = None
+        if hasattr(os, "timerfd_create"):
+            self._fd = os.timerfd_create(time.CLOCK_MONOTONIC, flags=os.TFD_NONBLOCK)
+            os.timerfd_settime(self._fd, initial=interval, interval=interval)
+    
+    async def wait(self):
+        """等待下一个周期到达，错过的周期会被合并"""
+        if self._fd is None:
+            await asyncio.sleep(max(0, self._deadline - time.monotonic()))
+            self._deadline += self.interval
+            while self._deadline <= time.monotonic():
+                self._deadline += self.interval
+            return
+        
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        loop.add_reader(self._fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            await ready
+        finally:
+            loop.remove_reader(self._fd)
+        os.read(self._fd, 8)
+    
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+_SEPARATOR = "-" * 80
+# 停止后等待进行中读取完成的最长时间（秒）
+_STOP_GRACE = 1.0
+
+
 class RealtimeMonitor:
     """实时监控"""
     
-    def __init__(self, client: DeviceClient, items: List[Dict], interval: float = 1.0):
+    def __init__(self, client: AsyncDeviceClient, items: List[Dict], interval: float = 1.0):
         self.client = client
         self.items = items
         self.interval = interval
-        self.running = False
+        # 停止事件与所属事件循环，在 _run 中创建
+        self._stop: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending = set()
+        # 读取项每个周期都相同，请求体只编码一次（跨通道时按通道排序）；
+        # 响应还原为 items 的顺序后，名称按位置取
+        self._order = _channel_order(items)
+        self._body = json_dumps({
+            "items": items if self._order is None else [items[i] for i in self._order]
+        })
+        self._names = [item["name"] for item in items]
+        # 名称列宽填充只做一次，每帧只替换数值/错误部分
+        self._ok_prefix = [f"  ✓ {name:20s} = " for name in self._names]
+        self._err_prefix = [f"  ✗ {name:20s} - 错误: " for name in self._names]
+        # 输出交给后台线程，采样循环不会被终端写入阻塞
+        self.render_queue = queue.Queue(maxsize=8)
     
     def start(self):
         """开始实时监控"""
-        self.running = True
         print("=" * 80)
         print("实时监控开始 (按 Ctrl+C 停止)")
         print("=" * 80)
         
+        renderer = threading.Thread(target=self._render_loop, daemon=True)
+        renderer.start()
+        
         try:
-            while self.running:
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                result = self.client.batch_read(self.items)
-                
-                print(f"\n[{timestamp}] 状态: {result['message']}")
-                print("-" * 80)
-                
-                for item in result.get("data", []):
-                    status = "✓" if item.get("success") else "✗"
-                    name = item["name"]
+            asyncio.run(self._run())
+        except KeyboardInterrupt:
+            pass  # 无法安装信号处理（如 Windows）时由 Ctrl+C 直接中断
+        finally:
+            try:
+                self.render_queue.put(None, timeout=1)
+            except queue.Full:
+                pass  # 输出线程已无法消费，作为守护线程随进程退出
+            renderer.join(timeout=1)
+            print("\n\n监控停止")
+    
+    def stop(self):
+        """请求停止监控，可在任意线程调用；再次调用会立即取消进行中的读取"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._request_stop)
+    
+    def _request_stop(self):
+        if self._stop.is_set():
+            for task in self._pending:
+                task.cancel()
+        self._stop.set()
+    
+    async def _run(self):
+        """按固定周期发起读取，不等待上一次响应返回"""
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        try:
+            self._loop.add_signal_handler(signal.SIGINT, self._request_stop)
+            handles_sigint = True
+        except (NotImplementedError, RuntimeError):
+            handles_sigint = False
+        
+        pending = self._pending
+        timer = PeriodicTimer(self.interval)
+        stopped = asyncio.create_task(self._stop.wait())
+        try:
+            async with self.client:
+                while not self._stop.is_set():
+                    task = asyncio.create_task(self._poll())
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
                     
-                    if item.get("success"):
-                        value = item["value"]
-                        print(f"  {status} {name:20s} = {value}")
-                    else:
-                        error = item.get("error", "未知错误")
-                        print(f"  {status} {name:20s} - 错误: {error}")
+                    # 停止请求到达时立即结束等待，不必等到下一个周期
+                    tick = asyncio.create_task(timer.wait())
+                    await asyncio.wait({tick, stopped}, return_when=asyncio.FIRST_COMPLETED)
+                    tick.cancel()
                 
-                time.sleep(self.interval)
+                # 进行中的读取最多等待 _STOP_GRACE 秒，超时或再次 Ctrl+C 时取消
+                if pending:
+                    await asyncio.wait(list(pending), timeout=_STOP_GRACE)
+                    remaining = list(pending)
+                    for task in remaining:
+                        task.cancel()
+                    await asyncio.gather(*remaining, return_exceptions=True)
+        finally:
+            stopped.cancel()
+            timer.close()
+            if handles_sigint:
+                self._loop.remove_signal_handler(signal.SIGINT)
+            self._loop = None
+    
+    async def _poll(self):
+        """执行一次批量读取，结果交给输出线程"""
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            result = await self.client.batch_read_encoded(self._body)
+            result = _restore_order(result, self.items, self._order)
+        except Exception as e:
+            # 读取异常也作为一帧输出，避免该帧静默丢失、任务异常无人获取
+            result = _error_result(f"读取异常: {e!r}")
+        
+        try:
+            self.render_queue.put_nowait((timestamp, result))
+        except queue.Full:
+            pass  # 输出跟不上时丢弃该帧，不能拖慢采样
+    
+    def _render_loop(self):
+        """后台线程：格式化并输出每一帧结果"""
+        while True:
+            frame = self.render_queue.get()
+            if frame is None:
+                break
+            
+            try:
+                timestamp, result = frame
+                lines = [f"\n[{timestamp}] 状态: {result.get('message', '')}", _SEPARATOR]
+                lines += [
+                    f"{ok}{item.value}" if item.success
+                    else f"{err}{item.error or '未知错误'}"
+                    for ok, err, item in zip(self._ok_prefix, self._err_prefix, result.get("data") or [])
+                ]
                 
-        except KeyboardInterrupt:
-            print("\n\n监控停止")
-            self.running = False
+                sys.stdout.write("\n".join(lines) + "\n")
+                sys.stdout.flush()
+            except Exception as e:
+                # 单帧输出失败不能让线程退出，否则队列无人消费
+                sys.stderr.write(f"输出异常: {e!r}\n")
 
 
-def demo_basic_batch_read():
+async def demo_basic_batch_read(client: AsyncDeviceClient):
     """示例1: 基础批量读取"""
     print("\n" + "=" * 80)
     print("示例 1: 基础批量读取")
     print("=" * 80)
     
-    client = DeviceClient()
-    
     # 定义读取项
     items = [
         {
@@ -148,27 +485,25 @@ def demo_basic_batch_read():
         print(f"  - {item['name']}: Channel {item['channel_id']}, Addr {item['addr']}, Type {item['type']}")
     
     print("\n发送请求...")
-    result = client.batch_read(items)
+    result = await client.batch_read(items)
     
     print(f"\n响应状态: {result['state']}")
     print(f"响应消息: {result['message']}")
     print("\n读取结果:")
     
     for item in result.get("data", []):
-        if item.get("success"):
-            print(f"  ✓ {item['name']}: {item['value']}")
+        if item.success:
+            print(f"  ✓ {item.name}: {item.value}")
         else:
-            print(f"  ✗ {item['name']}: {item.get('error', '未知错误')}")
+            print(f"  ✗ {item.name}: {item.error or '未知错误'}")
 
 
-def demo_cross_channel_read():
+async def demo_cross_channel_read(client: AsyncDeviceClient):
     """示例2: 跨通道批量读取"""
     print("\n" + "=" * 80)
     print("示例 2: 跨通道批量读取")
     print("=" * 80)
     
-    client = DeviceClient()
-    
     # 从多个不同通道读取数据
     items = [
         {"name": "1号机温度", "channel_id": 3, "addr": 100, "type": "int16"},
@@ -179,37 +514,32 @@ def demo_cross_channel_read():
     ]
     
     print("\n跨 3 个通道读取 5 个数据点...")
-    result = client.batch_read(items)
+    result = await client.batch_read(items)
     
     print(f"\n{result['message']}")
     print("\n按通道分组显示:")
     
-    # 按通道分组
-    by_channel = {}
+    # 按通道分组（通过名称索引原始配置中的 channel_id）
+    cfg_by_name = {i["name"]: i for i in items}
+    by_channel = defaultdict(list)
     for item in result.get("data", []):
-        # 从原始配置中找到 channel_id
-        channel_id = next(i["channel_id"] for i in items if i["name"] == item["name"])
-        if channel_id not in by_channel:
-            by_channel[channel_id] = []
-        by_channel[channel_id].append(item)
+        by_channel[cfg_by_name[item.name]["channel_id"]].append(item)
     
     for channel_id, channel_items in sorted(by_channel.items()):
         print(f"\n  通道 {channel_id}:")
         for item in channel_items:
-            if item.get("success"):
-                print(f"    ✓ {item['name']}: {item['value']}")
+            if item.success:
+                print(f"    ✓ {item.name}: {item.value}")
             else:
-                print(f"    ✗ {item['name']}: {item.get('error')}")
+                print(f"    ✗ {item.name}: {item.error}")
 
 
-def demo_data_processing():
+async def demo_data_processing(client: AsyncDeviceClient):
     """示例3: 数据处理与转换"""
     print("\n" + "=" * 80)
     print("示例 3: 数据处理与转换")
     print("=" * 80)
     
-    client = DeviceClient()
-    
     # 定义带缩放系数的读取项
     items_config = [
         {"name": "温度", "channel_id": 3, "addr": 100, "type": "int16", "scale": 0.1, "unit": "°C"},
@@ -225,32 +555,32 @@ def demo_data_processing():
     ]
     
     print("\n读取原始数据...")
-    result = client.batch_read(read_items)
+    result = await client.batch_read(read_items)
     
     print("\n原始数据 → 工程数据:")
     print("-" * 80)
     
+    cfg_by_name = {c["name"]: c for c in items_config}
+    
     for item in result.get("data", []):
-        if not item.get("success"):
+        if not item.success:
             continue
         
         # 找到配置
-        config = next(c for c in items_config if c["name"] == item["name"])
+        config = cfg_by_name[item.name]
         
-        raw_value = item["value"]
+        raw_value = item.value
         scaled_value = raw_value * config["scale"]
         
         print(f"  {config['name']:10s}: {raw_value:12} (原始) → {scaled_value:12.3f} {config['unit']}")
 
 
-def demo_error_handling():
+async def demo_error_handling(client: AsyncDeviceClient):
     """示例4: 错误处理"""
     print("\n" + "=" * 80)
     print("示例 4: 错误处理演示")
     print("=" * 80)
     
-    client = DeviceClient()
-    
     # 故意包含一些错误的配置
     items = [
         {"name": "正常点位", "channel_id": 3, "addr": 100, "type": "int16"},
@@ -264,7 +594,7 @@ def demo_error_handling():
         print(f"  - {item['name']}")
     
     print("\n执行批量读取...")
-    result = client.batch_read(items)
+    result = await client.batch_read(items)
     
     print(f"\n{result['message']}")
     print("\n详细结果:")
@@ -273,12 +603,12 @@ def demo_error_handling():
     error_count = 0
     
     for item in result.get("data", []):
-        if item.get("success"):
+        if item.success:
             success_count += 1
-            print(f"  ✓ {item['name']:20s} = {item['value']}")
+            print(f"  ✓ {item.name:20s} = {item.value}")
         else:
             error_count += 1
-            print(f"  ✗ {item['name']:20s} - {item.get('error', '未知错误')}")
+            print(f"  ✗ {item.name:20s} - {item.error or '未知错误'}")
     
     print(f"\n统计: 成功 {success_count}, 失败 {error_count}")
 
@@ -289,7 +619,7 @@ def demo_realtime_monitoring():
     print("示例 5: 实时监控演示")
     print("=" * 80)
     
-    client = DeviceClient()
+    client = AsyncDeviceClient()
     
     # 定义监控点位
     items = [
@@ -311,14 +641,12 @@ def demo_realtime_monitoring():
     monitor.start()
 
 
-def demo_dict_mode():
+async def demo_dict_mode(client: AsyncDeviceClient):
     """示例6: 字典模式（简化访问）"""
     print("\n" + "=" * 80)
     print("示例 6: 字典模式 - 简化数据访问")
     print("=" * 80)
     
-    client = DeviceClient()
-    
     items = [
         {"name": "温度", "channel_id": 3, "addr": 100, "type": "int16"},
         {"name": "压力", "channel_id": 3, "addr": 200, "type": "float32"},
@@ -326,7 +654,7 @@ def demo_dict_mode():
     ]
     
     print("\n使用字典模式读取...")
-    data = client.batch_read_dict(items)
+    data = await client.batch_read_dict(items)
     
     print("\n可直接通过名称访问数据:")
     print(f"  temperature = data['温度'] / 10")
@@ -341,14 +669,15 @@ def demo_dict_mode():
         print("\n没有成功读取到数据")
 
 
-def demo_json_export():
+async def demo_json_export(client: AsyncDeviceClient):
     """示例7: 数据导出为 JSON"""
+    import json
+    from datetime import datetime
+    
     print("\n" + "=" * 80)
     print("示例 7: 数据导出为 JSON")
     print("=" * 80)
     
-    client = DeviceClient()
-    
     items = [
         {"name": "温度", "channel_id": 3, "addr": 100, "type": "int16"},
         {"name": "压力", "channel_id": 3, "addr": 200, "type": "float32"},
@@ -356,7 +685,7 @@ def demo_json_export():
     ]
     
     print("\n读取数据...")
-    result = client.batch_read(items)
+    result = await client.batch_read(items)
     
     # 构建导出数据
     export_data = {
@@ -366,14 +695,14 @@ def demo_json_export():
     }
     
     for item in result.get("data", []):
-        if item.get("success"):
-            export_data["readings"][item["name"]] = {
-                "value": item["value"],
+        if item.success:
+            export_data["readings"][item.name] = {
+                "value": item.value,
                 "success": True
             }
         else:
-            export_data["readings"][item["name"]] = {
-                "error": item.get("error"),
+            export_data["readings"][item.name] = {
+                "error": item.error,
                 "success": False
             }
     
@@ -387,6 +716,56 @@ def demo_json_export():
     #     f.write(json_str)
 
 
+# 当前演示任务的输出缓冲区（每个 asyncio 任务独立）
+_demo_output = contextvars.ContextVar("demo_output", default=None)
+
+
+class _TaskLocalStdout:
+    """按任务分流的 stdout：任务设置了缓冲区时写入缓冲区，否则写入原始 stdout"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+    
+    def write(self, text: str) -> int:
+        return (_demo_output.get() or self.stream).write(text)
+    
+    def flush(self):
+        self.stream.flush()
+
+
+async def _run_buffered(demo, client: AsyncDeviceClient, buf: io.StringIO):
+    """运行单个演示，输出写入该演示自己的缓冲区"""
+    _demo_output.set(buf)
+    await demo(client)
+
+
+async def run_demos(demos):
+    """
+    共享一个异步客户端，并发运行多个相互独立的演示
+    
+    各演示的输出先写入各自的缓冲区，全部完成后按列表顺序打印，避免输出交错
+    """
+    buffers = [io.StringIO() for _ in demos]
+    stdout = sys.stdout
+    sys.stdout = _TaskLocalStdout(stdout)
+    try:
+        async with AsyncDeviceClient() as client:
+            results = await asyncio.gather(
+                *[_run_buffered(func, client, buf) for func, buf in zip(demos, buffers)],
+                return_exceptions=True
+            )
+    finally:
+        sys.stdout = stdout
+    
+    for buf in buffers:
+        sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
+    
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
 def main():
     """主函数 - 运行所有演示"""
     print("""
@@ -401,13 +780,11 @@ def main():
     """)
     
     # 检查服务是否运行
-    try:
-        response = requests.get("http://localhost:8080/", timeout=2)
-        print("✓ 服务连接正常\n")
-    except:
+    if not check_server():
         print("✗ 无法连接到服务，请先启动 dm-rust")
         print("  运行: cd dm-rust && cargo run\n")
         return
+    print("✓ 服务连接正常\n")
     
     demos = [
         ("基础批量读取", demo_basic_batch_read),
@@ -439,13 +816,19 @@ def main():
             
             choice_num = int(choice)
             
+            if not check_server():
+                print("✗ 服务已断开，请确认 dm-rust 正在运行")
+                continue
+            
             if choice_num == len(demos) + 1:
-                # 运行所有（除了实时监控）
-                for name, func in demos[:-1]:  # 排除最后一个（实时监控）
-                    func()
-                    time.sleep(1)
+                # 并发运行所有（除了实时监控）
+                asyncio.run(run_demos([func for _, func in demos[:-1]]))  # 排除最后一个（实时监控）
             elif 1 <= choice_num <= len(demos):
-                demos[choice_num - 1][1]()
+                func = demos[choice_num - 1][1]
+                if inspect.iscoroutinefunction(func):
+                    asyncio.run(run_demos([func]))
+                else:
+                    func()
             else:
                 print("无效选择")
         
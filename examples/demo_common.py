@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+示例脚本共用的工具函数
+
+- JSON 编解码（优先使用 orjson，未安装时回退到标准库）
+- 服务在线探测
+"""
+
+import socket
+import time
+from typing import Any, Dict, Tuple
+from urllib.parse import urlsplit
+
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    import json
+    json_loads = json.loads
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# 探测结果缓存 {(host, port): (探测时间, 是否在线)}
+_HEALTH_TTL = 30.0
+_health_cache: Dict[Tuple[str, int], Tuple[float, bool]] = {}
+
+
+def check_server(base_url: str = "http://localhost:8080") -> bool:
+    """
+    通过 TCP 连接探测服务是否在线，结果缓存 30 秒
+
+    Args:
+        base_url: 服务地址
+
+    Returns:
+        服务端口可连接返回 True
+    """
+    parts = urlsplit(base_url)
+    key = (parts.hostname, parts.port or 80)
+    now = time.monotonic()
+
+    cached = _health_cache.get(key)
+    if cached is not None and now - cached[0] < _HEALTH_TTL:
+        return cached[1]
+
+    try:
+        socket.create_connection(key, timeout=0.5).close()
+        online = True
+    except OSError:
+        online = False
+
+    _health_cache[key] = (now, online)
+    return online
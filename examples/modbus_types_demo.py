@@ -6,9 +6,13 @@ Modbus 数据类型使用示例
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import time
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
+
+from demo_common import JSON_HEADERS, check_server, json_dumps, json_loads
 
 BASE_URL = "http://localhost:8080"
 
@@ -18,6 +22,25 @@ class ModbusClient:
     
     def __init__(self, base_url: str = BASE_URL):
         self.base_url = base_url
+        # 复用连接池，避免每次请求都重新建立 TCP 连接
+        self.session = requests.Session()
+        self.session.headers.update({"Connection": "keep-alive"})
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        )
+        self.session.mount("http://", adapter)
+    
+    def close(self):
+        """关闭连接池"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
     
     def read_typed(self, channel: int, addr: int, data_type: str) -> Optional[Any]:
         """
@@ -32,31 +55,36 @@ class ModbusClient:
             读取的值，失败返回 None
         """
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/device/execute",
-                json={
+                data=json_dumps({
                     "channel": channel,
                     "command": "read",
                     "params": {
                         "addr": addr,
                         "type": data_type
                     }
-                },
+                }),
+                headers=JSON_HEADERS,
                 timeout=5
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result["code"] == 0:
-                    return result["data"]["value"]
-                else:
-                    print(f"错误: {result['msg']}")
-            else:
-                print(f"HTTP错误: {response.status_code}")
-        except Exception as e:
+        except (requests.Timeout, requests.ConnectionError) as e:
             print(f"读取异常: {e}")
+            return None
         
-        return None
+        if response.status_code != 200:
+            print(f"HTTP错误: {response.status_code}")
+            return None
+        
+        try:
+            result = json_loads(response.content)
+            if result["code"] != 0:
+                print(f"错误: {result.get('msg')}")
+                return None
+            return result["data"]["value"]
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"响应解析失败: {e!r}")
+            return None
     
     def write_typed(self, channel: int, addr: int, value: Any, data_type: str) -> bool:
         """
@@ -72,9 +100,9 @@ class ModbusClient:
             成功返回 True，失败返回 False
         """
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/device/execute",
-                json={
+                data=json_dumps({
                     "channel": channel,
                     "command": "write",
                     "params": {
@@ -82,22 +110,58 @@ class ModbusClient:
                         "type": data_type,
                         "value": value
                     }
-                },
+                }),
+                headers=JSON_HEADERS,
                 timeout=5
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result["code"] == 0:
-                    return True
-                else:
-                    print(f"错误: {result['msg']}")
-            else:
-                print(f"HTTP错误: {response.status_code}")
-        except Exception as e:
+        except (requests.Timeout, requests.ConnectionError) as e:
             print(f"写入异常: {e}")
+            return False
+        
+        if response.status_code != 200:
+            print(f"HTTP错误: {response.status_code}")
+            return False
+        
+        try:
+            result = json_loads(response.content)
+            if result["code"] != 0:
+                print(f"错误: {result.get('msg')}")
+                return False
+            return True
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"响应解析失败: {e!r}")
+            return False
+    
+    def batch_read(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        批量读取多个点位（单次请求）
+        
+        Args:
+            items: 读取项列表，每项包含 name, channel_id, addr, type
+        
+        Returns:
+            结果列表（与 items 顺序一致），失败返回空列表
+        """
+        try:
+            response = self.session.post(
+                f"{self.base_url}/device/batchRead",
+                data=json_dumps({"items": items}),
+                headers=JSON_HEADERS,
+                timeout=10
+            )
+        except (requests.Timeout, requests.ConnectionError) as e:
+            print(f"批量读取异常: {e}")
+            return []
+        
+        if response.status_code != 200:
+            print(f"HTTP错误: {response.status_code}")
+            return []
         
-        return False
+        try:
+            return json_loads(response.content)["data"] or []
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"响应解析失败: {e!r}")
+            return []
 
 
 def example_temperature_sensor():
@@ -106,25 +170,25 @@ def example_temperature_sensor():
     print("示例1: 温度传感器（Int16，精度0.1°C）")
     print("="*60)
     
-    client = ModbusClient()
-    channel = 1
-    addr = 100
-    
-    # 写入温度值 25.6°C (存储为 256)
-    temp_celsius = 25.6
-    temp_raw = int(temp_celsius * 10)  # 转换为整数
-    
-    print(f"写入温度: {temp_celsius}°C (原始值: {temp_raw})")
-    if client.write_typed(channel, addr, temp_raw, "int16"):
-        print("✓ 写入成功")
+    with ModbusClient() as client:
+        channel = 1
+        addr = 100
+        
+        # 写入温度值 25.6°C (存储为 256)
+        temp_celsius = 25.6
+        temp_raw = int(temp_celsius * 10)  # 转换为整数
         
-        # 读取并转换
-        raw_value = client.read_typed(channel, addr, "int16")
-        if raw_value is not None:
-            actual_temp = raw_value / 10.0
-            print(f"✓ 读取成功: {actual_temp}°C (原始值: {raw_value})")
-    else:
-        print("✗ 写入失败")
+        print(f"写入温度: {temp_celsius}°C (原始值: {temp_raw})")
+        if client.write_typed(channel, addr, temp_raw, "int16"):
+            print("✓ 写入成功")
+            
+            # 读取并转换
+            raw_value = client.read_typed(channel, addr, "int16")
+            if raw_value is not None:
+                actual_temp = raw_value / 10.0
+                print(f"✓ 读取成功: {actual_temp}°C (原始值: {raw_value})")
+        else:
+            print("✗ 写入失败")
 
 
 def example_pressure_sensor():
@@ -133,24 +197,24 @@ def example_pressure_sensor():
     print("示例2: 压力传感器（Float32）")
     print("="*60)
     
-    client = ModbusClient()
-    channel = 1
-    addr = 200
-    
-    # 写入压力值
-    pressure = 101325.5  # Pa (标准大气压)
-    
-    print(f"写入压力: {pressure} Pa")
-    if client.write_typed(channel, addr, pressure, "float32"):
-        print("✓ 写入成功")
+    with ModbusClient() as client:
+        channel = 1
+        addr = 200
+        
+        # 写入压力值
+        pressure = 101325.5  # Pa (标准大气压)
         
-        # 读取
-        value = client.read_typed(channel, addr, "float32")
-        if value is not None:
-            print(f"✓ 读取成功: {value} Pa")
-            print(f"  精度损失: {abs(value - pressure)} Pa")
-    else:
-        print("✗ 写入失败")
+        print(f"写入压力: {pressure} Pa")
+        if client.write_typed(channel, addr, pressure, "float32"):
+            print("✓ 写入成功")
+            
+            # 读取
+            value = client.read_typed(channel, addr, "float32")
+            if value is not None:
+                print(f"✓ 读取成功: {value} Pa")
+                print(f"  精度损失: {abs(value - pressure)} Pa")
+        else:
+            print("✗ 写入失败")
 
 
 def example_flow_counter():
@@ -159,32 +223,32 @@ def example_flow_counter():
     print("示例3: 流量累计器（UInt32）")
     print("="*60)
     
-    client = ModbusClient()
-    channel = 1
-    addr = 300
-    
-    # 初始化计数器
-    initial_count = 1234567
-    
-    print(f"初始化计数器: {initial_count} L")
-    if client.write_typed(channel, addr, initial_count, "uint32"):
-        print("✓ 写入成功")
+    with ModbusClient() as client:
+        channel = 1
+        addr = 300
         
-        # 模拟增加
-        time.sleep(0.1)
-        new_count = initial_count + 100
+        # 初始化计数器
+        initial_count = 1234567
         
-        print(f"更新计数器: {new_count} L (+100)")
-        if client.write_typed(channel, addr, new_count, "uint32"):
-            print("✓ 更新成功")
+        print(f"初始化计数器: {initial_count} L")
+        if client.write_typed(channel, addr, initial_count, "uint32"):
+            print("✓ 写入成功")
             
-            # 读取
-            value = client.read_typed(channel, addr, "uint32")
-            if value is not None:
-                print(f"✓ 读取成功: {value} L")
-                print(f"  增量: {value - initial_count} L")
-    else:
-        print("✗ 初始化失败")
+            # 模拟增加
+            time.sleep(0.1)
+            new_count = initial_count + 100
+            
+            print(f"更新计数器: {new_count} L (+100)")
+            if client.write_typed(channel, addr, new_count, "uint32"):
+                print("✓ 更新成功")
+                
+                # 读取
+                value = client.read_typed(channel, addr, "uint32")
+                if value is not None:
+                    print(f"✓ 读取成功: {value} L")
+                    print(f"  增量: {value - initial_count} L")
+        else:
+            print("✗ 初始化失败")
 
 
 def example_position_encoder():
@@ -193,28 +257,28 @@ def example_position_encoder():
     print("示例4: 位置编码器（Int32，单位：μm）")
     print("="*60)
     
-    client = ModbusClient()
-    channel = 1
-    addr = 500
-    
-    # 测试正负位置
-    positions = [0, 1000000, -500000, 2500000]
-    
-    for pos in positions:
-        print(f"\n设置位置: {pos} μm ({pos/1000:.1f} mm)")
-        if client.write_typed(channel, addr, pos, "int32"):
-            print("  ✓ 写入成功")
-            
-            # 读取验证
-            value = client.read_typed(channel, addr, "int32")
-            if value is not None:
-                print(f"  ✓ 读取成功: {value} μm ({value/1000:.1f} mm)")
-                if value == pos:
-                    print("  ✓ 值匹配")
-                else:
-                    print(f"  ✗ 值不匹配（差异: {value - pos}）")
-        else:
-            print("  ✗ 写入失败")
+    with ModbusClient() as client:
+        channel = 1
+        addr = 500
+        
+        # 测试正负位置
+        positions = [0, 1000000, -500000, 2500000]
+        
+        for pos in positions:
+            print(f"\n设置位置: {pos} μm ({pos/1000:.1f} mm)")
+            if client.write_typed(channel, addr, pos, "int32"):
+                print("  ✓ 写入成功")
+                
+                # 读取验证
+                value = client.read_typed(channel, addr, "int32")
+                if value is not None:
+                    print(f"  ✓ 读取成功: {value} μm ({value/1000:.1f} mm)")
+                    if value == pos:
+                        print("  ✓ 值匹配")
+                    else:
+                        print(f"  ✗ 值不匹配（差异: {value - pos}）")
+            else:
+                print("  ✗ 写入失败")
 
 
 def example_high_precision_scale():
@@ -223,24 +287,24 @@ def example_high_precision_scale():
     print("示例5: 高精度天平（Float64）")
     print("="*60)
     
-    client = ModbusClient()
-    channel = 1
-    addr = 600
-    
-    # 写入高精度重量
-    weight = 123.456789012345  # 克
-    
-    print(f"写入重量: {weight:.12f} g")
-    if client.write_typed(channel, addr, weight, "float64"):
-        print("✓ 写入成功")
+    with ModbusClient() as client:
+        channel = 1
+        addr = 600
+        
+        # 写入高精度重量
+        weight = 123.456789012345  # 克
         
-        # 读取
-        value = client.read_typed(channel, addr, "float64")
-        if value is not None:
-            print(f"✓ 读取成功: {value:.12f} g")
-            print(f"  精度损失: {abs(value - weight):.15e} g")
-    else:
-        print("✗ 写入失败")
+        print(f"写入重量: {weight:.12f} g")
+        if client.write_typed(channel, addr, weight, "float64"):
+            print("✓ 写入成功")
+            
+            # 读取
+            value = client.read_typed(channel, addr, "float64")
+            if value is not None:
+                print(f"✓ 读取成功: {value:.12f} g")
+                print(f"  精度损失: {abs(value - weight):.15e} g")
+        else:
+            print("✗ 写入失败")
 
 
 def example_bool_controls():
@@ -249,40 +313,40 @@ def example_bool_controls():
     print("示例6: 布尔控制（开关、指示灯）")
     print("="*60)
     
-    client = ModbusClient()
-    channel = 1
-    
-    # 定义控制点
-    controls = {
-        "启动开关": 0,
-        "报警指示": 1,
-        "运行指示灯": 2
-    }
-    
-    for name, addr in controls.items():
-        print(f"\n{name} (地址:{addr}):")
-        
-        # 设置为 True
-        print("  设置为 ON (true)")
-        if client.write_typed(channel, addr, True, "bool"):
-            print("    ✓ 写入成功")
-            
-            # 读取验证
-            value = client.read_typed(channel, addr, "bool")
-            if value is not None:
-                print(f"    ✓ 读取成功: {'ON' if value else 'OFF'}")
+    with ModbusClient() as client:
+        channel = 1
         
-        time.sleep(0.1)
+        # 定义控制点
+        controls = {
+            "启动开关": 0,
+            "报警指示": 1,
+            "运行指示灯": 2
+        }
         
-        # 设置为 False
-        print("  设置为 OFF (false)")
-        if client.write_typed(channel, addr, False, "bool"):
-            print("    ✓ 写入成功")
+        for name, addr in controls.items():
+            print(f"\n{name} (地址:{addr}):")
             
-            # 读取验证
-            value = client.read_typed(channel, addr, "bool")
-            if value is not None:
-                print(f"    ✓ 读取成功: {'ON' if value else 'OFF'}")
+            # 设置为 True
+            print("  设置为 ON (true)")
+            if client.write_typed(channel, addr, True, "bool"):
+                print("    ✓ 写入成功")
+                
+                # 读取验证
+                value = client.read_typed(channel, addr, "bool")
+                if value is not None:
+                    print(f"    ✓ 读取成功: {'ON' if value else 'OFF'}")
+            
+            time.sleep(0.1)
+            
+            # 设置为 False
+            print("  设置为 OFF (false)")
+            if client.write_typed(channel, addr, False, "bool"):
+                print("    ✓ 写入成功")
+                
+                # 读取验证
+                value = client.read_typed(channel, addr, "bool")
+                if value is not None:
+                    print(f"    ✓ 读取成功: {'ON' if value else 'OFF'}")
 
 
 def example_little_endian():
@@ -291,36 +355,36 @@ def example_little_endian():
     print("示例7: 小端序数据（PLC设备）")
     print("="*60)
     
-    client = ModbusClient()
-    channel = 2  # 假设通道2是小端序的PLC
-    
-    # UInt32LE 测试
-    print("\nUInt32LE 测试:")
-    addr_uint32le = 100
-    value_uint32le = 0x12345678
-    
-    print(f"  写入: 0x{value_uint32le:08X} ({value_uint32le})")
-    if client.write_typed(channel, addr_uint32le, value_uint32le, "uint32le"):
-        print("  ✓ 写入成功")
+    with ModbusClient() as client:
+        channel = 2  # 假设通道2是小端序的PLC
         
-        # 读取
-        result = client.read_typed(channel, addr_uint32le, "uint32le")
-        if result is not None:
-            print(f"  ✓ 读取成功: 0x{result:08X} ({result})")
-    
-    # Float32LE 测试
-    print("\nFloat32LE 测试:")
-    addr_float32le = 200
-    value_float32le = 3.14159
-    
-    print(f"  写入: {value_float32le}")
-    if client.write_typed(channel, addr_float32le, value_float32le, "float32le"):
-        print("  ✓ 写入成功")
+        # UInt32LE 测试
+        print("\nUInt32LE 测试:")
+        addr_uint32le = 100
+        value_uint32le = 0x12345678
+        
+        print(f"  写入: 0x{value_uint32le:08X} ({value_uint32le})")
+        if client.write_typed(channel, addr_uint32le, value_uint32le, "uint32le"):
+            print("  ✓ 写入成功")
+            
+            # 读取
+            result = client.read_typed(channel, addr_uint32le, "uint32le")
+            if result is not None:
+                print(f"  ✓ 读取成功: 0x{result:08X} ({result})")
+        
+        # Float32LE 测试
+        print("\nFloat32LE 测试:")
+        addr_float32le = 200
+        value_float32le = 3.14159
         
-        # 读取
-        result = client.read_typed(channel, addr_float32le, "float32le")
-        if result is not None:
-            print(f"  ✓ 读取成功: {result}")
+        print(f"  写入: {value_float32le}")
+        if client.write_typed(channel, addr_float32le, value_float32le, "float32le"):
+            print("  ✓ 写入成功")
+            
+            # 读取
+            result = client.read_typed(channel, addr_float32le, "float32le")
+            if result is not None:
+                print(f"  ✓ 读取成功: {result}")
 
 
 def example_batch_monitoring():
@@ -329,7 +393,6 @@ def example_batch_monitoring():
     print("示例8: 批量监控传感器数据")
     print("="*60)
     
-    client = ModbusClient()
     channel = 1
     
     # 定义传感器配置
@@ -342,24 +405,34 @@ def example_batch_monitoring():
         {"name": "位置", "addr": 500, "type": "int32", "scale": 0.001, "unit": "mm"},
     ]
     
+    # 所有传感器合并为一次批量读取请求
+    items = [
+        {"name": s["name"], "channel_id": channel, "addr": s["addr"], "type": s["type"]}
+        for s in sensors
+    ]
+    
     print("\n开始监控（按 Ctrl+C 停止）...\n")
     
-    try:
-        for i in range(3):  # 只演示3次
-            print(f"--- 第 {i+1} 次读取 ---")
-            
-            for sensor in sensors:
-                value = client.read_typed(channel, sensor["addr"], sensor["type"])
-                if value is not None:
-                    scaled_value = value * sensor["scale"]
-                    print(f"  {sensor['name']:8s}: {scaled_value:12.2f} {sensor['unit']}")
-                else:
-                    print(f"  {sensor['name']:8s}: 读取失败")
-            
-            print()
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("\n监控已停止")
+    with ModbusClient() as client:
+        try:
+            for i in range(3):  # 只演示3次
+                print(f"--- 第 {i+1} 次读取 ---")
+                
+                # 按名称对应结果；请求失败或响应缺项时该传感器按读取失败处理
+                results = {r.get("name"): r for r in client.batch_read(items)}
+                
+                for sensor in sensors:
+                    result = results.get(sensor["name"], {})
+                    if result.get("success"):
+                        scaled_value = result["value"] * sensor["scale"]
+                        print(f"  {sensor['name']:8s}: {scaled_value:12.2f} {sensor['unit']}")
+                    else:
+                        print(f"  {sensor['name']:8s}: 读取失败")
+                
+                print()
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print("\n监控已停止")
 
 
 def main():
@@ -373,11 +446,7 @@ def main():
     """)
     
     # 检查服务器连接
-    try:
-        response = requests.get(f"{BASE_URL}/health", timeout=2)
-        if response.status_code != 200:
-            print("⚠ 警告: 服务器可能未正常运行")
-    except:
+    if not check_server(BASE_URL):
         print("✗ 错误: 无法连接到服务器")
         print(f"  请确保服务器正在运行: {BASE_URL}")
         return